@@ -5,24 +5,223 @@ This script helps analyze GitHub issues, prioritize them, and assist with code u
 """
 
 import os
+import re
 import sys
+import atexit
 import json
 import time
 import argparse
+import random
+import heapq
+import calendar
+import operator
+import threading
+import functools
 import requests
-from datetime import datetime
-from typing import List, Dict, Any, Optional, Tuple
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib.parse import parse_qs, urlencode, urlparse
+from urllib3.util.retry import Retry
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+
+try:
+    import orjson  # Optional: much faster JSON encoding/decoding
+except ImportError:
+    orjson = None
+
+# Default configuration file shipped next to this script
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'mcp_config.json')
+
+# GraphQL endpoint and issue selections: only the fields the agent reads,
+# instead of the full REST issue objects
+GRAPHQL_URL = "https://api.github.com/graphql"
+_ISSUES_QUERY = """
+query($owner: String!, $name: String!, $states: [IssueState!], $first: Int!, $cursor: String) {
+  repository(owner: $owner, name: $name) {
+    issues(first: $first, after: $cursor, states: $states, orderBy: {field: CREATED_AT, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes { ...%s }
+    }
+  }
+}
+"""
+
+# Fields rendered by display_issue_summary
+_ISSUE_SUMMARY_FRAGMENT = """
+fragment IssueSummary on Issue {
+  number title body state url createdAt
+  author { login }
+  assignees(first: 10) { nodes { login } }
+  labels(first: 20) { nodes { name } }
+}
+"""
+
+# Summary fields plus what prioritize_issues scores on
+_ISSUE_FULL_FRAGMENT = _ISSUE_SUMMARY_FRAGMENT + """
+fragment IssueFull on Issue {
+  ...IssueSummary
+  comments { totalCount }
+}
+"""
+
+# Complete query text for each get_issues_graphql(fields=...) variant
+_ISSUE_QUERIES = {
+    'summary': _ISSUES_QUERY % 'IssueSummary' + _ISSUE_SUMMARY_FRAGMENT,
+    'full': _ISSUES_QUERY % 'IssueFull' + _ISSUE_FULL_FRAGMENT,
+}
+
+# Seconds a GET response stays fresh in the in-memory cache, and how many are kept
+MEMORY_CACHE_TTL = 90
+MEMORY_CACHE_SIZE = 512
+
+# Seconds an issue page stays fresh in the in-memory cache, by issue state
+ISSUE_CACHE_TTL = {'open': 60, 'closed': 3600, 'all': 60}
+
+# Extensions that mark a bare token as a file mention in analyze_issue
+FILE_EXTENSIONS = ('py', 'js', 'ts', 'html', 'css', 'md', 'go', 'rs', 'java', 'cpp', 'h')
+
+# Candidate file mentions: maximal runs of path characters. Matching whole runs
+# keeps the scan linear even on long unbroken tokens such as pasted blobs.
+_FILE_TOKEN_RE = re.compile(r'[\w.:/-]+')
+_FILE_SUFFIXES = tuple('.' + ext for ext in FILE_EXTENSIONS)
+
+# Sentence punctuation _FILE_TOKEN_RE can include at either end of a token
+_FILE_EDGE_CHARS = '.:'
+
+# Worker threads used to fetch issue pages concurrently
+PAGE_FETCH_WORKERS = 8
+
+# (connect, read) seconds to wait for GitHub before a request is retried
+REQUEST_TIMEOUT = (5, 30)
+
+# Connection pool sizing; kept above the page-fetch worker count so
+# concurrent fetches never discard pooled keep-alive connections
+POOL_CONNECTIONS = 16
+POOL_MAXSIZE = 32
+
+# Retry policy for transient failures and rate limiting (seconds)
+MAX_RETRIES = 5
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 60.0
+BACKOFF_JITTER = 1.0
+
+# On-disk store of validators (ETag / Last-Modified) and bodies for conditional GET requests
+RESPONSE_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'mcp_agent', 'responses.json')
+
+# Bounds on the on-disk cache: entries kept, and seconds since an entry was last validated
+RESPONSE_CACHE_MAX_ENTRIES = 256
+RESPONSE_CACHE_MAX_AGE = 7 * 24 * 3600
+
+def _json_loads(data: bytes) -> Any:
+    """Decode JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _json_dumps(obj: Any) -> bytes:
+    """Encode an object as compact JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+def _decode_body(content: Any) -> Any:
+    """Decode a raw response body, treating an empty body as {}"""
+    return _json_loads(content) if content else {}
+
+@functools.lru_cache(maxsize=None)
+def _load_config(config_path: str = CONFIG_PATH) -> Dict:
+    """Load and parse the agent configuration once per process"""
+    try:
+        with open(config_path, 'rb') as f:
+            return _json_loads(f.read())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def _compile_terms(terms: List[str]) -> Optional['re.Pattern']:
+    """Compile terms, lowercased, into one substring matcher for lowercased text, or None if empty"""
+    if not terms:
+        return None
+    return re.compile('|'.join(re.escape(term.lower()) for term in terms))
+
+def _parse_timestamp(timestamp: str) -> int:
+    """Convert a GitHub 'YYYY-MM-DDTHH:MM:SSZ' timestamp to seconds since the epoch"""
+    return calendar.timegm((int(timestamp[0:4]), int(timestamp[5:7]), int(timestamp[8:10]),
+                            int(timestamp[11:13]), int(timestamp[14:16]), int(timestamp[17:19]), 0, 0, 0))
+
+def _body_stats(item: Dict) -> Tuple[int, int]:
+    """Return the body length and code fence count of an issue or comment"""
+    body = item.get('body') or ''
+    return len(body), body.count('```')
+
+def _graphql_issue_to_rest(node: Dict) -> Dict:
+    """Convert a GraphQL issue node to the REST issue shape used throughout the agent"""
+    issue = {
+        'number': node['number'],
+        'title': node['title'],
+        'body': node['body'],
+        'state': node['state'].lower(),
+        'html_url': node['url'],
+        'created_at': node['createdAt'],
+        'user': {'login': (node.get('author') or {}).get('login', 'ghost')},
+        'assignees': [{'login': a['login']} for a in node['assignees']['nodes']],
+        'labels': [{'name': l['name']} for l in node['labels']['nodes']],
+    }
+    if 'comments' in node:
+        issue['comments'] = node['comments']['totalCount']
+    return issue
+
+def _iter_bodies(issue: Dict, comments: List[Dict]) -> Iterator[str]:
+    """Yield the issue body followed by each comment body"""
+    yield issue.get('body') or ''
+    for comment in comments:
+        yield comment.get('body') or ''
+
+@functools.lru_cache(maxsize=1024)
+def _approach_for(title_lc: str, complexity: str) -> str:
+    """Suggested approach for a lowercased issue title, cached since titles repeat across calls"""
+    # This is a simplified approach generator
+    # In a real system, you would use LLM or more sophisticated analysis
+    if 'bug' in title_lc or 'fix' in title_lc:
+        return f"This appears to be a bug fix with {complexity.lower()} complexity. Recommend debugging and creating a test case first."
+    elif 'feature' in title_lc or 'add' in title_lc:
+        return f"This is a feature request with {complexity.lower()} complexity. Recommend starting with requirements clarification and design."
+    elif 'documentation' in title_lc or 'docs' in title_lc:
+        return "This is a documentation task. Update relevant docs and ensure examples are working."
+    else:
+        return f"General task with {complexity.lower()} complexity. Analyze requirements and break down into smaller steps."
+
+def create_session() -> requests.Session:
+    """Create a pooled HTTP session with the agent's retry policy, shareable between agents"""
+    session = requests.Session()
+    # The only retry layer for connection failures and server errors; rate
+    # limits are waited out in _request. Failed connections are retried for
+    # any method since nothing was sent, but read timeouts and 5xx replies
+    # only for GET so a comment is never posted twice.
+    retry = Retry(total=MAX_RETRIES, backoff_factor=BACKOFF_BASE,
+                  status_forcelist=[500, 502, 503, 504],
+                  allowed_methods=['GET'], raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=retry)
+    session.mount('https://', adapter)
+    return session
 
 class GitHubMCPAgent:
     """Model Context Protocol Agent for GitHub"""
     
-    def __init__(self, repo: str, token: Optional[str] = None):
+    # Conditional request cache shared by every agent in the process, loaded on
+    # first use and saved once at exit or whenever an agent is closed
+    _shared_response_cache: Optional[Dict[str, Dict]] = None
+    _response_cache_dirty = False
+    
+    def __init__(self, repo: str, token: Optional[str] = None,
+                 session: Optional[requests.Session] = None):
         """
         Initialize the GitHub MCP Agent
         
         Args:
             repo: GitHub repository in format 'username/repo'
             token: GitHub Personal Access Token (optional)
+            session: Session from create_session() to share with other agents (optional)
         """
         self.repo = repo
         self.token = token or os.environ.get('GITHUB_TOKEN')
@@ -33,13 +232,129 @@ class GitHubMCPAgent:
         if self.token:
             self.headers['Authorization'] = f'token {self.token}'
         
+        # Reuse one pooled session so keep-alive connections to api.github.com
+        # are shared across requests instead of re-handshaking every call.
+        # A caller-supplied session may serve other agents, so it is left
+        # untouched and our headers are sent with each request instead.
+        self._owns_session = session is None
+        if self._owns_session:
+            self.session = create_session()
+            self.session.headers.update(self.headers)
+            self._request_headers: Dict[str, str] = {}
+        else:
+            self.session = session
+            self._request_headers = dict(self.headers)
+        
+        # Conditional request cache: url -> {'etag', 'last_modified', 'body', 'links', 'stored_at'},
+        # where 'body' is the raw JSON text. A 304 reply is served from here
+        # and does not count against the rate limit.
+        if GitHubMCPAgent._shared_response_cache is None:
+            GitHubMCPAgent._shared_response_cache = self._load_response_cache()
+            atexit.register(GitHubMCPAgent._save_response_cache)
+        self._response_cache = GitHubMCPAgent._shared_response_cache
+        
+        # Rate limit state, refreshed from the X-RateLimit-* headers of every response
+        self._rl_remaining: Optional[int] = None
+        self._rl_reset = 0
+        
+        # In-memory LRU of recent GET responses: url -> (expires_at, raw body, links).
+        # Bodies are decoded on every hit so callers never share mutable results.
+        self._memory_cache: 'OrderedDict[str, Tuple[float, Any, Dict]]' = OrderedDict()
+        self._memory_lock = threading.Lock()
+        
         # Verify connection
         self._verify_connection()
     
+    def __enter__(self) -> 'GitHubMCPAgent':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
+    def close(self) -> None:
+        """Persist caches and close the underlying HTTP session"""
+        self._save_response_cache()
+        if self._owns_session:
+            self.session.close()
+    
+    def invalidate(self) -> None:
+        """Drop in-memory cached responses and configuration"""
+        with self._memory_lock:
+            self._memory_cache.clear()
+        _load_config.cache_clear()
+    
+    def _memory_get(self, url: str) -> Optional[Tuple[Any, Dict]]:
+        """Return a freshly decoded in-memory (body, links) for a URL, if any"""
+        with self._memory_lock:
+            entry = self._memory_cache.get(url)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._memory_cache[url]
+                return None
+            self._memory_cache.move_to_end(url)
+        return _decode_body(entry[1]), entry[2]
+    
+    def _memory_put(self, url: str, content: Any, links: Dict, ttl: float) -> None:
+        """Store a raw GET response body in memory, evicting the least recently used entry when full"""
+        with self._memory_lock:
+            self._memory_cache[url] = (time.monotonic() + ttl, content, links)
+            self._memory_cache.move_to_end(url)
+            if len(self._memory_cache) > MEMORY_CACHE_SIZE:
+                self._memory_cache.popitem(last=False)
+    
+    def _memory_invalidate(self, url: str) -> None:
+        """Drop in-memory entries for a written URL, the resources it belongs to and those under it"""
+        # Compare whole path segments without the query, so writing to issues/52/comments
+        # drops issues/52 and the issues?state=... list pages but not issues/5
+        path = url.split('?', 1)[0]
+        with self._memory_lock:
+            for key in list(self._memory_cache):
+                key_path = key.split('?', 1)[0]
+                if (key_path == path or path.startswith(key_path + '/')
+                        or key_path.startswith(path + '/')):
+                    del self._memory_cache[key]
+    
+    @staticmethod
+    def _load_response_cache() -> Dict[str, Dict]:
+        """Load the conditional request cache from disk, skipping expired or outdated entries"""
+        try:
+            with open(RESPONSE_CACHE_PATH, 'rb') as f:
+                entries = _json_loads(f.read())
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(entries, dict):
+            return {}
+        cutoff = time.time() - RESPONSE_CACHE_MAX_AGE
+        return {url: entry for url, entry in entries.items()
+                if isinstance(entry, dict) and isinstance(entry.get('body'), str)
+                and isinstance(entry.get('stored_at'), (int, float)) and entry['stored_at'] > cutoff}
+    
+    @classmethod
+    def _save_response_cache(cls) -> None:
+        """Persist the most recently validated cache entries to disk if the cache changed"""
+        if not cls._response_cache_dirty:
+            return
+        # Write to a temporary file and swap it in, so an interrupted save
+        # never leaves a truncated cache behind
+        tmp_path = f"{RESPONSE_CACHE_PATH}.{os.getpid()}.tmp"
+        try:
+            cutoff = time.time() - RESPONSE_CACHE_MAX_AGE
+            entries = heapq.nlargest(RESPONSE_CACHE_MAX_ENTRIES, list(cls._shared_response_cache.items()),
+                                     key=lambda item: item[1].get('stored_at', 0))
+            os.makedirs(os.path.dirname(RESPONSE_CACHE_PATH), exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                f.write(_json_dumps({url: entry for url, entry in entries if entry.get('stored_at', 0) > cutoff}))
+            os.replace(tmp_path, RESPONSE_CACHE_PATH)
+            cls._response_cache_dirty = False
+        except OSError as e:
+            print(f"Warning: Could not save response cache: {e}")
+    
     def _verify_connection(self) -> None:
         """Verify connection to GitHub API"""
         try:
-            response = requests.get(self.base_url, headers=self.headers)
+            response = self.session.get(self.base_url, headers=self._request_headers, timeout=REQUEST_TIMEOUT)
+            self._update_rate_limits(response)
             response.raise_for_status()
             print(f"✅ Successfully connected to GitHub repository: {self.repo}")
         except requests.exceptions.RequestException as e:
@@ -47,54 +362,156 @@ class GitHubMCPAgent:
             sys.exit(1)
     
     def _make_request(self, endpoint: str, method: str = 'GET', data: Optional[Dict] = None) -> Dict:
-        """Make a request to the GitHub API with rate limit handling"""
-        url = f"{self.base_url}/{endpoint}"
-        try:
-            # Check rate limits first
-            self._check_rate_limits()
-            
-            if method == 'GET':
-                response = requests.get(url, headers=self.headers)
-            elif method == 'POST':
-                response = requests.post(url, headers=self.headers, json=data)
-            elif method == 'PATCH':
-                response = requests.patch(url, headers=self.headers, json=data)
-            else:
-                raise ValueError(f"Unsupported HTTP method: {method}")
-            
-            # Handle rate limiting
-            if response.status_code == 403 and 'rate limit exceeded' in response.text.lower():
-                reset_time = int(response.headers.get('X-RateLimit-Reset', 0))
-                wait_time = max(reset_time - time.time(), 0) + 1
-                print(f"⚠️ Rate limit exceeded. Waiting for {wait_time:.0f} seconds...")
-                time.sleep(wait_time)
-                return self._make_request(endpoint, method, data)  # Retry after waiting
+        """Make a request to the GitHub API with rate limit handling and retries"""
+        return self._request(endpoint, method, data)[0]
+    
+    def _request(self, endpoint: str, method: str = 'GET', data: Optional[Dict] = None,
+                 ttl: float = MEMORY_CACHE_TTL) -> Tuple[Any, Dict]:
+        """
+        Make a request to the GitHub API, returning the decoded body and its parsed Link header
+        
+        Successful GET responses are kept in memory for ttl seconds; POST and
+        PATCH requests drop the cached entries they may have changed.
+        """
+        if method not in ('GET', 'POST', 'PATCH'):
+            raise ValueError(f"Unsupported HTTP method: {method}")
+        
+        url = endpoint if endpoint.startswith('https://') else f"{self.base_url}/{endpoint}"
+        if method == 'GET':
+            hit = self._memory_get(url)
+            if hit is not None:
+                return hit
+        
+        cached = self._response_cache.get(url) if method == 'GET' else None
+        headers = dict(self._request_headers)
+        if cached:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+        # Encode request bodies once, up front, with the same fast encoder used for responses
+        body = None
+        if data is not None:
+            body = _json_dumps(data)
+            headers['Content-Type'] = 'application/json'
+        # Connection errors and server errors are already retried by the session's
+        # adapter; this loop only waits out rate limit rejections
+        for attempt in range(MAX_RETRIES):
+            try:
+                # Wait out the rate limit window if we are about to exhaust it
+                self._wait_for_rate_limit()
                 
-            response.raise_for_status()
-            return response.json() if response.content else {}
-        except requests.exceptions.RequestException as e:
-            print(f"Error making request to {url}: {e}")
-            return {}
-            
-    def _check_rate_limits(self) -> None:
-        """Check GitHub API rate limits and wait if needed"""
-        try:
-            response = requests.get("https://api.github.com/rate_limit", headers=self.headers)
-            if response.status_code == 200:
-                data = response.json()
-                core = data.get('resources', {}).get('core', {})
-                remaining = core.get('remaining', 1)
-                reset_time = core.get('reset', 0)
+                response = self.session.request(method, url, headers=headers, data=body,
+                                                timeout=REQUEST_TIMEOUT)
+                self._update_rate_limits(response)
+                if response.status_code == 304 and cached:
+                    links = response.links or cached.get('links', {})
+                    cached['stored_at'] = time.time()
+                    GitHubMCPAgent._response_cache_dirty = True
+                    self._memory_put(url, cached['body'], links, ttl)
+                    return _decode_body(cached['body']), links
                 
-                if remaining <= 5:  # Keep a small buffer
-                    wait_time = max(reset_time - time.time(), 0) + 1
-                    print(f"⚠️ Only {remaining} API calls remaining. Waiting for {wait_time:.0f} seconds...")
+                # Handle primary and secondary rate limiting
+                if self._is_rate_limited(response):
+                    wait_time = self._retry_delay(response, attempt)
+                    print(f"⚠️ Rate limit exceeded. Waiting for {wait_time:.0f} seconds...")
                     time.sleep(wait_time)
-        except Exception as e:
+                    continue
+                
+                response.raise_for_status()
+                content = response.content
+                result = _decode_body(content)
+                
+                # Cache the raw body rather than result, which callers may modify
+                etag = response.headers.get('ETag')
+                last_modified = response.headers.get('Last-Modified')
+                if method == 'GET' and (etag or last_modified):
+                    self._response_cache[url] = {'etag': etag, 'last_modified': last_modified,
+                                                 'body': content.decode('utf-8'), 'links': response.links,
+                                                 'stored_at': time.time()}
+                    GitHubMCPAgent._response_cache_dirty = True
+                
+                if method == 'GET':
+                    self._memory_put(url, content, response.links, ttl)
+                else:
+                    self._memory_invalidate(url)
+                
+                return result, response.links
+            except (requests.exceptions.RequestException, ValueError) as e:
+                # ValueError: a 2xx body that is not valid JSON
+                print(f"Error making request to {url}: {e}")
+                return {}, {}
+        
+        print(f"Error making request to {url}: giving up after {MAX_RETRIES} attempts")
+        return {}, {}
+    
+    @staticmethod
+    def _is_rate_limited(response: requests.Response) -> bool:
+        """Whether a response is a primary or secondary rate limit rejection"""
+        if response.status_code not in (403, 429):
+            return False
+        return ('Retry-After' in response.headers
+                or response.headers.get('X-RateLimit-Remaining') == '0'
+                or 'rate limit' in response.text.lower())
+    
+    @staticmethod
+    def _backoff(attempt: int) -> float:
+        """Exponential backoff delay with jitter for the given attempt"""
+        return min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt) + random.uniform(0, BACKOFF_JITTER)
+    
+    def _retry_delay(self, response: requests.Response, attempt: int) -> float:
+        """Seconds to wait before retrying a rate-limited response"""
+        retry_after = response.headers.get('Retry-After')
+        if retry_after and retry_after.isdigit():
+            return int(retry_after) + random.uniform(0, BACKOFF_JITTER)
+        if response.headers.get('X-RateLimit-Remaining') == '0':
+            reset_time = int(response.headers.get('X-RateLimit-Reset', 0))
+            return max(reset_time - time.time(), 0) + 1 + random.uniform(0, BACKOFF_JITTER)
+        return self._backoff(attempt)
+    
+    def _update_rate_limits(self, response: requests.Response) -> None:
+        """Record the rate limit state reported in a response's headers"""
+        # GraphQL calls draw on a separate quota; only track the REST 'core' one
+        if response.headers.get('X-RateLimit-Resource', 'core') != 'core':
+            return
+        remaining = response.headers.get('X-RateLimit-Remaining')
+        if remaining is not None:
+            self._rl_remaining = int(remaining)
+            self._rl_reset = int(response.headers.get('X-RateLimit-Reset', 0))
+    
+    def _wait_for_rate_limit(self) -> None:
+        """Sleep until the rate limit resets if only a few calls remain"""
+        if self._rl_remaining is None or self._rl_remaining > 5:  # Keep a small buffer
+            return
+        wait_time = self._rl_reset - time.time()
+        if wait_time > 0:
+            print(f"⚠️ Only {self._rl_remaining} API calls remaining. Waiting for {wait_time + 1:.0f} seconds...")
+            time.sleep(wait_time + 1)
+        self._rl_remaining = None
+    
+    def refresh_rate_limit(self) -> Dict:
+        """
+        Query the rate limit endpoint and update the tracked rate limit state
+        
+        Returns:
+            The 'core' rate limit resource reported by GitHub
+        """
+        try:
+            response = self.session.get("https://api.github.com/rate_limit", headers=self._request_headers,
+                                        timeout=REQUEST_TIMEOUT)
+            response.raise_for_status()
+            core = response.json().get('resources', {}).get('core', {})
+            self._rl_remaining = core.get('remaining', self._rl_remaining)
+            self._rl_reset = core.get('reset', self._rl_reset)
+            return core
+        except requests.exceptions.RequestException as e:
             print(f"Warning: Could not check rate limits: {e}")
+            return {}
     
     def get_issues(self, state: str = 'open', sort: str = 'created', 
-                  direction: str = 'desc', limit: int = 100) -> List[Dict]:
+                  direction: str = 'desc', limit: int = 100,
+                  labels: Optional[List[str]] = None, assignee: Optional[str] = None,
+                  since: Optional[str] = None) -> List[Dict]:
         """
         Get issues from the repository
         
@@ -103,31 +520,135 @@ class GitHubMCPAgent:
             sort: Sort field ('created', 'updated', 'comments')
             direction: Sort direction ('asc', 'desc')
             limit: Maximum number of issues to return
+            labels: Only return issues carrying all of these labels
+            assignee: Only return issues assigned to this username
+            since: Only return issues updated at or after this ISO 8601 timestamp
         
         Returns:
             List of issues
         """
-        issues = []
-        page = 1
+        return list(self.iter_issues(state, sort, direction, limit, labels, assignee, since))
+    
+    def iter_issues(self, state: str = 'open', sort: str = 'created', 
+                    direction: str = 'desc', limit: int = 100,
+                    labels: Optional[List[str]] = None, assignee: Optional[str] = None,
+                    since: Optional[str] = None) -> Iterator[Dict]:
+        """
+        Yield issues from the repository as their pages arrive
+        
+        Takes the same arguments as get_issues. Stopping iteration early
+        avoids holding the remaining issues in memory.
+        """
+        if limit <= 0:
+            return
+        count = 0
+        for batch in self._iter_issue_pages(state, sort, direction, limit, labels, assignee, since):
+            for issue in batch:
+                yield issue
+                count += 1
+                if count >= limit:
+                    return
+    
+    def _iter_issue_pages(self, state: str, sort: str, direction: str, limit: int,
+                          labels: Optional[List[str]], assignee: Optional[str],
+                          since: Optional[str]) -> Iterator[List[Dict]]:
+        """Yield pages of issues in order until enough have been fetched for the limit"""
         per_page = min(100, limit)
+        params = {'state': state, 'sort': sort, 'direction': direction, 'per_page': per_page}
+        # Filters are applied by GitHub so unmatched issues are never transferred
+        if labels:
+            params['labels'] = ','.join(labels)
+        if assignee:
+            params['assignee'] = assignee
+        if since:
+            params['since'] = since
+        base_endpoint = f"issues?{urlencode(params)}"
         
-        while len(issues) < limit:
-            endpoint = f"issues?state={state}&sort={sort}&direction={direction}&per_page={per_page}&page={page}"
-            batch = self._make_request(endpoint)
+        def fetch_page(endpoint: str) -> Tuple[List[Dict], Dict]:
+            batch, links = self._request(endpoint, ttl=ISSUE_CACHE_TTL.get(state, 60))
+            if not isinstance(batch, list):
+                # _request reports failures as {}; say so rather than silently truncating
+                print(f"⚠️ Could not fetch issues from {endpoint}; results may be incomplete")
+                return [], {}
+            return batch, links
+        
+        batch, links = fetch_page(f"{base_endpoint}&page=1")
+        if not batch:
+            return
+        yield batch
+        if 'next' not in links:
+            return
+        
+        # The first page tells us how many pages exist, so fetch the rest
+        # concurrently unless the remaining rate limit is too low for a burst
+        last_url = links.get('last', {}).get('url')
+        if last_url and (self._rl_remaining is None or self._rl_remaining >= 10):
+            last_page = int(parse_qs(urlparse(last_url).query).get('page', ['1'])[0])
+            last_page = min(last_page, -(-limit // per_page))
+            endpoints = [f"{base_endpoint}&page={page}" for page in range(2, last_page + 1)]
+            with ThreadPoolExecutor(max_workers=PAGE_FETCH_WORKERS) as executor:
+                for batch, _ in executor.map(fetch_page, endpoints):
+                    yield batch
+            return
+        
+        # Little rate limit left: follow the rel="next" links one page at a time
+        fetched = len(batch)
+        while fetched < limit and 'next' in links:
+            batch, links = fetch_page(links['next']['url'])
             
             if not batch:
                 break
                 
-            issues.extend(batch)
+            yield batch
+            fetched += len(batch)
+    
+    def get_issues_graphql(self, state: str = 'open', limit: int = 100,
+                           fields: str = 'full') -> Optional[List[Dict]]:
+        """
+        Get issues through the GraphQL API, transferring only the fields the agent uses
+        
+        Requires a token. Issues come back in the same shape as get_issues,
+        newest first, and unlike the REST endpoint never include pull requests.
+        
+        Args:
+            state: State of issues ('open', 'closed', 'all')
+            limit: Maximum number of issues to return
+            fields: 'summary' for just the fields shown by display_issue_summary,
+                    'full' to also include what prioritize_issues needs
+        
+        Returns:
+            List of issues, or None if GraphQL is unavailable (for example
+            blocked by SSO or not granted to the token)
+        """
+        query = _ISSUE_QUERIES[fields]
+        owner, name = self.repo.split('/', 1)
+        variables = {
+            'owner': owner,
+            'name': name,
+            'states': None if state == 'all' else [state.upper()],
+            'cursor': None,
+        }
+        issues = []
+        
+        while len(issues) < limit:
+            variables['first'] = min(100, limit - len(issues))
+            result = self._make_request(GRAPHQL_URL, method='POST',
+                                        data={'query': query, 'variables': variables})
+            repository = (result.get('data') or {}).get('repository') or {}
+            connection = repository.get('issues')
+            if result.get('errors') or not connection:
+                print(f"Error fetching issues via GraphQL: {result.get('errors', 'no data returned')}")
+                return None
             
-            if len(batch) < per_page:
+            issues.extend(_graphql_issue_to_rest(node) for node in connection['nodes'])
+            
+            if not connection['pageInfo']['hasNextPage']:
                 break
-                
-            page += 1
+            variables['cursor'] = connection['pageInfo']['endCursor']
         
         return issues[:limit]
     
-    def prioritize_issues(self, issues: List[Dict]) -> List[Dict]:
+    def prioritize_issues(self, issues: List[Dict], top_k: Optional[int] = None) -> List[Dict]:
         """
         Prioritize issues based on various factors and user expertise
         
@@ -139,16 +660,15 @@ class GitHubMCPAgent:
         - Match with user expertise
         - Contributor friendliness
         
+        Args:
+            issues: Issues to score
+            top_k: Only return the top_k highest priority issues (optional)
+        
         Returns:
             List of issues sorted by priority (highest first)
         """
         # Load configuration
-        config_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'mcp_config.json')
-        try:
-            with open(config_path, 'r') as f:
-                config = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            config = {}
+        config = _load_config()
         
         # Get user expertise and preferences
         user_expertise = config.get('agent', {}).get('user_expertise', [])
@@ -156,50 +676,59 @@ class GitHubMCPAgent:
         medium_priority_labels = config.get('github', {}).get('issue_priorities', {}).get('medium', [])
         preferred_issue_types = config.get('actions', {}).get('contribution_preferences', {}).get('issue_types', [])
         
+        # Lowercase and compile the matching terms once rather than per issue and label
+        high_re = _compile_terms(high_priority_labels)
+        medium_re = _compile_terms(medium_priority_labels)
+        expertise_terms = tuple(expertise.lower() for expertise in user_expertise)
+        preferred_terms = tuple(issue_type.lower() for issue_type in preferred_issue_types)
+        
         prioritized = []
+        now = time.time()
         
         for issue in issues:
             # Calculate priority score
-            age_days = (datetime.now() - datetime.strptime(issue['created_at'], 
-                                                          '%Y-%m-%dT%H:%M:%SZ')).days
+            age_days = int((now - _parse_timestamp(issue['created_at'])) // 86400)
             comments_count = issue['comments']
             
-            # Check for priority labels
-            labels = [label['name'].lower() for label in issue.get('labels', [])]
-            
-            # Label-based priority
+            # Label-based priority, lowercasing each label once in a single pass
+            labels = []
             label_score = 0
-            for label in labels:
-                if any(high_label.lower() in label for high_label in high_priority_labels):
+            for label in issue.get('labels', ()):
+                name = label['name'].lower()
+                labels.append(name)
+                if high_re and high_re.search(name):
                     label_score += 10
-                if any(medium_label.lower() in label for medium_label in medium_priority_labels):
+                if medium_re and medium_re.search(name):
                     label_score += 5
+            # One newline-joined string lets substring probes cover every label in a
+            # single scan without a term matching across two labels
+            label_blob = '\n'.join(labels)
             
             # Contributor friendliness
             contributor_score = 0
-            if any('good first issue' in label for label in labels):
+            if 'good first issue' in label_blob:
                 contributor_score += 15
-            if any('help wanted' in label for label in labels):
+            if 'help wanted' in label_blob:
                 contributor_score += 10
-            if any('beginner' in label for label in labels):
+            if 'beginner' in label_blob:
                 contributor_score += 8
             
             # Expertise match
             expertise_score = 0
-            issue_text = (issue.get('title', '') + ' ' + issue.get('body', '')).lower()
-            for expertise in user_expertise:
-                if expertise.lower() in issue_text:
+            issue_text = ((issue.get('title') or '') + ' ' + (issue.get('body') or '')).lower()
+            for expertise in expertise_terms:
+                if expertise in issue_text:
                     expertise_score += 5
             
             # Preference match
             preference_score = 0
-            for issue_type in preferred_issue_types:
-                if any(issue_type.lower() in label for label in labels):
+            for issue_type in preferred_terms:
+                if issue_type in label_blob:
                     preference_score += 8
             
             # Estimate complexity
-            description_length = len(issue['body']) if issue.get('body') else 0
-            code_block_count = issue['body'].count('```') // 2 if issue.get('body') else 0
+            description_length, fence_count = _body_stats(issue)
+            code_block_count = fence_count // 2
             complexity_penalty = (description_length * 0.01) + (code_block_count * 2)
             
             # Calculate priority score
@@ -220,23 +749,25 @@ class GitHubMCPAgent:
             issue['complexity_estimate'] = 'High' if complexity_penalty > 15 else 'Medium' if complexity_penalty > 5 else 'Low'
             prioritized.append(issue)
         
-        # Sort by priority score (highest first)
-        return sorted(prioritized, key=lambda x: x['priority_score'], reverse=True)
+        # Sort by priority score (highest first), only ordering the top_k when given
+        by_score = operator.itemgetter('priority_score')
+        if top_k is not None:
+            return heapq.nlargest(top_k, prioritized, key=by_score)
+        return sorted(prioritized, key=by_score, reverse=True)
     
-    def get_assigned_issues(self, username: str) -> List[Dict]:
+    def get_assigned_issues(self, username: str, labels: Optional[List[str]] = None) -> List[Dict]:
         """
         Get issues assigned to a specific user
         
         Args:
             username: GitHub username
+            labels: Only return issues carrying all of these labels (optional)
             
         Returns:
             List of issues assigned to the user
         """
-        issues = self.get_issues(limit=100)
-        return [issue for issue in issues if any(
-            assignee['login'] == username for assignee in issue.get('assignees', [])
-        )]
+        # Let GitHub filter by assignee instead of downloading every issue
+        return self.get_issues(limit=100, labels=labels, assignee=username)
     
     def analyze_issue(self, issue_number: int) -> Dict:
         """
@@ -252,55 +783,50 @@ class GitHubMCPAgent:
             - Related files (if mentioned in comments)
             - Suggested approach
         """
-        # Get issue details
-        issue = self._make_request(f"issues/{issue_number}")
+        # Fetch issue details and comments concurrently over the shared session
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            issue_future = executor.submit(self._make_request, f"issues/{issue_number}")
+            comments_future = executor.submit(self._make_request, f"issues/{issue_number}/comments")
+            issue = issue_future.result()
+            comments = comments_future.result()
+        
         if not issue:
             return {"error": f"Issue #{issue_number} not found"}
         
-        # Get comments
-        comments = self._make_request(f"issues/{issue_number}/comments")
+        # Scan the issue and comment bodies one at a time for file mentions,
+        # without building a concatenated copy of the whole thread
+        tokens = set()
+        for body in _iter_bodies(issue, comments):
+            tokens.update(_FILE_TOKEN_RE.findall(body))
+        # Classify and trim each distinct token once rather than per occurrence:
+        # path-like tokens containing a dot, or names with a known file extension
+        potential_files = set()
+        for token in tokens:
+            name = token.strip(_FILE_EDGE_CHARS)
+            if ('/' in name and '.' in token) or name.endswith(_FILE_SUFFIXES):
+                potential_files.add(name)
         
-        # Analyze issue text and comments for file mentions
-        all_text = issue.get('body', '') + ' ' + ' '.join([c.get('body', '') for c in comments])
-        
-        # Simple file pattern detection (can be improved with regex)
-        potential_files = []
-        for word in all_text.split():
-            if ('.' in word and '/' in word) or word.endswith(('.py', '.js', '.html', '.css', '.md')):
-                potential_files.append(word.strip('.,()[]{}:;"\''))
-        
-        # Estimate complexity
-        description_length = len(issue.get('body', ''))
-        code_blocks = all_text.count('```')
+        # Estimate complexity; a code block is a pair of fences, as in prioritize_issues
+        description_length, fence_count = _body_stats(issue)
+        fence_count += sum(_body_stats(comment)[1] for comment in comments)
+        code_blocks = fence_count // 2
         complexity = "Low"
-        if description_length > 500 or code_blocks > 4:
+        if description_length > 500 or code_blocks > 2:
             complexity = "High"
-        elif description_length > 200 or code_blocks > 2:
+        elif description_length > 200 or code_blocks > 1:
             complexity = "Medium"
         
         return {
             "issue": issue,
             "comments_count": len(comments),
             "complexity": complexity,
-            "potential_files": list(set(potential_files)),
+            "potential_files": sorted(potential_files),
             "suggested_approach": self._generate_approach(issue, complexity)
         }
     
     def _generate_approach(self, issue: Dict, complexity: str) -> str:
         """Generate a suggested approach based on the issue"""
-        title = issue.get('title', '')
-        body = issue.get('body', '')
-        
-        # This is a simplified approach generator
-        # In a real system, you would use LLM or more sophisticated analysis
-        if 'bug' in title.lower() or 'fix' in title.lower():
-            return f"This appears to be a bug fix with {complexity.lower()} complexity. Recommend debugging and creating a test case first."
-        elif 'feature' in title.lower() or 'add' in title.lower():
-            return f"This is a feature request with {complexity.lower()} complexity. Recommend starting with requirements clarification and design."
-        elif 'documentation' in title.lower() or 'docs' in title.lower():
-            return "This is a documentation task. Update relevant docs and ensure examples are working."
-        else:
-            return f"General task with {complexity.lower()} complexity. Analyze requirements and break down into smaller steps."
+        return _approach_for((issue.get('title') or '').lower(), complexity)
     
     def create_comment(self, issue_number: int, comment_text: str) -> Dict:
         """
@@ -321,36 +847,53 @@ class GitHubMCPAgent:
     
     def display_issue_summary(self, issue: Dict) -> None:
         """Print a summary of an issue"""
-        print(f"\n{'=' * 80}")
-        print(f"Issue #{issue['number']}: {issue['title']}")
-        print(f"{'=' * 80}")
-        print(f"Status: {issue['state']}")
-        print(f"Created: {issue['created_at']}")
-        print(f"Author: {issue['user']['login']}")
+        # Assemble the whole summary and emit it with one write
+        lines = [
+            f"\n{'=' * 80}",
+            f"Issue #{issue['number']}: {issue['title']}",
+            f"{'=' * 80}",
+            f"Status: {issue['state']}",
+            f"Created: {issue['created_at']}",
+            f"Author: {issue['user']['login']}",
+        ]
         
         if issue.get('assignees'):
             assignees = ', '.join([a['login'] for a in issue['assignees']])
-            print(f"Assigned to: {assignees}")
+            lines.append(f"Assigned to: {assignees}")
         
         if issue.get('labels'):
             labels = ', '.join([l['name'] for l in issue['labels']])
-            print(f"Labels: {labels}")
+            lines.append(f"Labels: {labels}")
         
         if issue.get('priority_score'):
-            print(f"Priority Score: {issue['priority_score']:.2f}")
+            lines.append(f"Priority Score: {issue['priority_score']:.2f}")
         
-        print(f"\nDescription:")
-        print(f"{'-' * 40}")
-        print(issue.get('body', 'No description provided')[:300] + 
-              ('...' if issue.get('body', '') and len(issue['body']) > 300 else ''))
-        print(f"\nURL: {issue['html_url']}")
-        print(f"{'=' * 80}\n")
+        body = issue.get('body') or 'No description provided'
+        lines.append(f"\nDescription:")
+        lines.append(f"{'-' * 40}")
+        lines.append(body[:300] + ('...' if len(body) > 300 else ''))
+        lines.append(f"\nURL: {issue['html_url']}")
+        lines.append(f"{'=' * 80}\n")
+        sys.stdout.write('\n'.join(lines) + '\n')
+
+def fetch_issues(agent: GitHubMCPAgent, limit: int, labels: Optional[List[str]] = None,
+                 fields: str = 'full') -> List[Dict]:
+    """Fetch issues for the CLI actions, using the lighter GraphQL query when possible"""
+    # GraphQL needs a token, and its label filter matches any label rather than all of them
+    if agent.token and not labels:
+        issues = agent.get_issues_graphql(limit=limit, fields=fields)
+        if issues is not None:
+            return issues
+        print("Falling back to the REST API")
+    return agent.get_issues(limit=limit, labels=labels)
 
 def main():
     """Main function to run the GitHub MCP Agent"""
     parser = argparse.ArgumentParser(description='GitHub MCP Agent')
     parser.add_argument('--repo', help='GitHub repository (username/repo)')
-    parser.add_argument('--token', help='GitHub Personal Access Token')
+    parser.add_argument('--token', help='GitHub Personal Access Token (default: $GITHUB_TOKEN). With a token, '
+                        'list, prioritize and recommend fetch issues through GraphQL, which excludes '
+                        'pull requests, unless --labels is given')
     parser.add_argument('--action', choices=['list', 'prioritize', 'assigned', 'analyze', 'recommend'], 
                         default='list', help='Action to perform')
     parser.add_argument('--username', help='GitHub username (for assigned issues)')
@@ -358,14 +901,16 @@ def main():
     parser.add_argument('--limit', type=int, default=10, help='Maximum number of issues to display')
     parser.add_argument('--expertise', nargs='+', help='Your areas of expertise (space-separated)')
     parser.add_argument('--config', help='Path to config file (default: mcp_config.json)')
+    parser.add_argument('--labels', nargs='+', help='Only fetch issues carrying all of these labels '
+                        '(list, prioritize, recommend and assigned actions)')
     
     args = parser.parse_args()
     
     # Load configuration
-    config_path = args.config or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'mcp_config.json')
+    config_path = args.config or CONFIG_PATH
     try:
-        with open(config_path, 'r') as f:
-            config = json.load(f)
+        with open(config_path, 'rb') as f:
+            config = _json_loads(f.read())
             # Use repo from config if not specified in command line
             if not args.repo:
                 args.repo = config.get('github', {}).get('repository')
@@ -389,26 +934,29 @@ def main():
         try:
             with open(config_path, 'w') as f:
                 json.dump(config, f, indent=2)
+            _load_config.cache_clear()
             print(f"Updated expertise in config file: {', '.join(args.expertise)}")
         except Exception as e:
             print(f"Warning: Could not update config file: {e}")
     
     # Perform requested action
     if args.action == 'list':
-        issues = agent.get_issues(limit=args.limit)
-        print(f"\nFound {len(issues)} issues in {args.repo}:")
+        print(f"\nIssues in {args.repo}:")
+        # Only the displayed fields are needed when listing
+        issues = fetch_issues(agent, args.limit, args.labels, fields='summary')
         for issue in issues:
             agent.display_issue_summary(issue)
+        print(f"Found {len(issues)} issues in {args.repo}")
     
     elif args.action == 'prioritize':
-        issues = agent.get_issues(limit=100)  # Get more issues for better prioritization
-        prioritized = agent.prioritize_issues(issues)
+        issues = fetch_issues(agent, 100, args.labels)  # Get more issues for better prioritization
+        prioritized = agent.prioritize_issues(issues, top_k=args.limit)
         print(f"\nTop {args.limit} prioritized issues in {args.repo}:")
-        for issue in prioritized[:args.limit]:
+        for issue in prioritized:
             agent.display_issue_summary(issue)
     
     elif args.action == 'recommend':
-        issues = agent.get_issues(limit=100)  # Get more issues for better prioritization
+        issues = fetch_issues(agent, 100, args.labels)  # Get more issues for better prioritization
         prioritized = agent.prioritize_issues(issues)
         
         # Filter for contributor-friendly issues that match expertise
@@ -428,7 +976,6 @@ def main():
         for i, issue in enumerate(recommended[:args.limit], 1):
             print(f"\nRECOMMENDATION #{i}:")
             agent.display_issue_summary(issue)
-            print(f"Why this issue: ")
             reasons = []
             if issue.get('contributor_friendly'):
                 reasons.append("✅ Marked as good for contributors")
@@ -439,15 +986,15 @@ def main():
             if issue.get('priority_score', 0) > 30:
                 reasons.append("✅ High priority for the project")
             
-            for reason in reasons:
-                print(f"  {reason}")
+            lines = [f"Why this issue: "] + [f"  {reason}" for reason in reasons]
+            sys.stdout.write('\n'.join(lines) + '\n')
     
     elif args.action == 'assigned':
         if not args.username:
             print("Error: --username is required for 'assigned' action")
             sys.exit(1)
         
-        assigned = agent.get_assigned_issues(args.username)
+        assigned = agent.get_assigned_issues(args.username, args.labels)
         print(f"\nFound {len(assigned)} issues assigned to {args.username} in {args.repo}:")
         for issue in assigned[:args.limit]:
             agent.display_issue_summary(issue)
@@ -465,19 +1012,21 @@ def main():
         issue = analysis['issue']
         agent.display_issue_summary(issue)
         
-        print(f"Detailed Analysis:")
-        print(f"{'=' * 80}")
-        print(f"Complexity: {analysis['complexity']}")
-        print(f"Comments: {analysis['comments_count']}")
+        lines = [
+            f"Detailed Analysis:",
+            f"{'=' * 80}",
+            f"Complexity: {analysis['complexity']}",
+            f"Comments: {analysis['comments_count']}",
+        ]
         
         if analysis['potential_files']:
-            print(f"\nPotentially related files:")
-            for file in analysis['potential_files']:
-                print(f"- {file}")
+            lines.append(f"\nPotentially related files:")
+            lines.extend(f"- {file}" for file in analysis['potential_files'])
         
-        print(f"\nSuggested approach:")
-        print(analysis['suggested_approach'])
-        print(f"{'=' * 80}\n")
+        lines.append(f"\nSuggested approach:")
+        lines.append(analysis['suggested_approach'])
+        lines.append(f"{'=' * 80}\n")
+        sys.stdout.write('\n'.join(lines) + '\n')
 
 if __name__ == "__main__":
     main()